@@ -58,6 +58,32 @@ data "archive_file" "lambda_package" {
   output_path = "lambda_function.zip"
 }
 
+# Third-party dependencies of the Lambda (see lambda-layer/requirements.txt),
+# built in Docker so the native wheels match the arm64 runtime
+module "test_function_deps" {
+  source = "git::https://github.com/terraform-aws-modules/terraform-aws-lambda.git?ref=v8.0.1"
+
+  create_layer = true
+
+  layer_name               = "IgorovoTestFunctionDeps"
+  compatible_runtimes      = ["python3.13"]
+  compatible_architectures = ["arm64"]
+  runtime                  = "python3.13"
+
+  source_path = [
+    {
+      path             = "${path.module}/lambda-layer"
+      pip_requirements = true
+      prefix_in_zip    = "python"
+      patterns         = ["!requirements.txt"]
+    }
+  ]
+
+  build_in_docker           = true
+  docker_image              = "public.ecr.aws/sam/build-python3.13:latest-arm64"
+  docker_additional_options = ["--platform", "linux/arm64"]
+}
+
 module "test_function" {
   source = "git::https://github.com/terraform-aws-modules/terraform-aws-lambda.git?ref=v8.0.1"
 
@@ -67,9 +93,20 @@ module "test_function" {
   architectures = ["arm64"]
   publish       = true
 
+  # Leaves room for the JWKS fetch (2s timeout in lambda_function.py) on cold start
+  timeout = 10
+
   create_package         = false
   local_existing_package = data.archive_file.lambda_package.output_path
 
+  layers = [module.test_function_deps.lambda_layer_arn]
+
+  # Used to verify the X-Cognito-Id-Token signature
+  environment_variables = {
+    COGNITO_USER_POOL_ID = aws_cognito_user_pool.this.id
+    COGNITO_CLIENT_ID    = aws_cognito_user_pool_client.default.id
+  }
+
   # Set to false when using publish = true for better production practices
   create_current_version_allowed_triggers = false
 
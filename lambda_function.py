@@ -1,31 +1,197 @@
 import json
 import logging
-import base64
+import binascii
+import os
+import time
+from functools import lru_cache
+
+# Try to import pybase64 for SIMD-accelerated base64 decoding
+try:
+    import pybase64
+
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    pybase64 = None
+    PYBASE64_AVAILABLE = False
+
+# Try to import orjson for faster JSON encoding/decoding
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# Try to import PyJWT (with the "crypto" extra) for ID token signature verification
+try:
+    import jwt
+
+    PYJWT_AVAILABLE = True
+except ImportError:
+    jwt = None
+    PYJWT_AVAILABLE = False
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger()
 
+# Cognito User Pool settings (set by Terraform, AWS_REGION is set by Lambda itself)
+COGNITO_USER_POOL_ID = os.environ.get("COGNITO_USER_POOL_ID")
+COGNITO_CLIENT_ID = os.environ.get("COGNITO_CLIENT_ID")
+COGNITO_REGION = os.environ.get("AWS_REGION", "us-east-1")
+COGNITO_ISSUER = (
+    f"https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}"
+    if COGNITO_USER_POOL_ID
+    else None
+)
+
+# With a User Pool configured, ID tokens must be verified - if PyJWT is
+# missing every token is rejected rather than trusted unverified
+JWT_VERIFICATION_ENABLED = COGNITO_ISSUER is not None
+
+# The JWKS is fetched on first use and cached for 5 minutes, so rotated keys
+# are picked up without refetching on every unknown kid. The fetch timeout is
+# kept well below the function timeout (see apigw.tf) so a slow endpoint makes
+# verification fail closed instead of timing out the whole invocation
+_jwks_client = (
+    jwt.PyJWKClient(f"{COGNITO_ISSUER}/.well-known/jwks.json", lifespan=300, timeout=2)
+    if PYJWT_AVAILABLE and JWT_VERIFICATION_ENABLED
+    else None
+)
+
+# After a failed JWKS fetch, don't retry it on every request for a while
+_JWKS_RETRY_AFTER = 30
+_jwks_failed_at = None
+
+if JWT_VERIFICATION_ENABLED and not PYJWT_AVAILABLE:
+    logger.error("PyJWT not available - all ID tokens will be rejected")
+
+# URL-safe base64 alphabet -> standard alphabet, built once at import time
+_URLSAFE_B64_TABLE = bytes.maketrans(b"-_", b"+/")
+
+# Possible group claim names, in order of precedence
+_GROUP_CLAIMS = (
+    "cognito:groups",
+    "groups",
+    "custom:groups",
+    "memberOf",
+    "roles",
+)
+_GROUP_CLAIMS_SET = frozenset(_GROUP_CLAIMS)
+
+# Static parts of the handler response
+_RESPONSE_HEADERS = {"Content-Type": "application/json"}
+_HELLO_MSG = "Hello from Lambda!"
+
+
+def _get_jwk_set():
+    """Get the cached User Pool JWKS, backing off after a failed fetch"""
+    global _jwks_failed_at
+
+    if (
+        _jwks_failed_at is not None
+        and time.monotonic() - _jwks_failed_at < _JWKS_RETRY_AFTER
+    ):
+        raise jwt.PyJWKClientError("JWKS fetch failed recently, not retrying yet")
 
-def decode_jwt_payload(token):
-    """Decode JWT token payload without verification (for development/testing)"""
     try:
-        # Split the JWT token into its three parts
-        parts = token.split(".")
-        if len(parts) != 3:
-            logger.error("Invalid JWT token format")
-            return None
+        jwk_set = _jwks_client.get_jwk_set()
+    except Exception:
+        _jwks_failed_at = time.monotonic()
+        raise
+
+    _jwks_failed_at = None
+    return jwk_set
+
+
+def _get_signing_key(token):
+    """Find the token's signing key in the cached User Pool JWKS"""
+    kid = jwt.get_unverified_header(token).get("kid")
+
+    # Only look in the cached key set - PyJWKClient.get_signing_key() refetches
+    # on unknown kids, which would let clients force an outbound call per request
+    for key in _get_jwk_set().keys:
+        if key.key_id == kid:
+            return key
+
+    raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+
+
+def _verify_jwt_token(token):
+    """Verify ID token signature and claims against the User Pool JWKS"""
+    if _jwks_client is None:
+        raise RuntimeError("PyJWT not available, cannot verify ID token")
+
+    signing_key = _get_signing_key(token)
+    payload = jwt.decode(
+        token,
+        key=signing_key.key,
+        algorithms=["RS256"],
+        audience=COGNITO_CLIENT_ID,
+        issuer=COGNITO_ISSUER,
+        options={
+            "require": ["exp", "iss"],
+            "verify_aud": COGNITO_CLIENT_ID is not None,
+        },
+    )
+
+    if payload.get("token_use") != "id":
+        logger.error("JWT token is not an ID token")
+        return None
+
+    return payload
+
+
+@lru_cache(maxsize=1024)
+def _decode_jwt_payload_cached(token):
+    """Decode JWT token payload, memoized per raw token string"""
+    # Failed verification raises, so forged tokens never end up in the cache
+    if JWT_VERIFICATION_ENABLED:
+        return _verify_jwt_token(token)
 
-        # Decode the payload (second part)
-        payload_part = parts[1]
+    # Locate the payload (second part) without splitting out header and signature
+    first_dot = token.find(".")
+    second_dot = token.find(".", first_dot + 1)
+    if first_dot < 0 or second_dot < 0 or token.find(".", second_dot + 1) >= 0:
+        logger.error("Invalid JWT token format")
+        return None
+
+    payload_part = token[first_dot + 1 : second_dot]
+
+    # Add padding if needed for base64 decoding
+    padding = 4 - len(payload_part) % 4
+    if padding != 4:
+        payload_part += "=" * padding
+
+    # Decode from base64
+    if PYBASE64_AVAILABLE:
+        decoded_bytes = pybase64.urlsafe_b64decode(payload_part)
+    else:
+        # Same result as base64.urlsafe_b64decode, minus its generic
+        # str/bytes argument handling
+        decoded_bytes = binascii.a2b_base64(
+            payload_part.encode("ascii").translate(_URLSAFE_B64_TABLE)
+        )
 
-        # Add padding if needed for base64 decoding
-        padding = 4 - len(payload_part) % 4
-        if padding != 4:
-            payload_part += "=" * padding
+    if ORJSON_AVAILABLE:
+        # orjson parses bytes directly, skipping the intermediate str
+        return orjson.loads(decoded_bytes)
+    return json.loads(decoded_bytes.decode("utf-8"))
 
-        # Decode from base64
-        decoded_bytes = base64.urlsafe_b64decode(payload_part)
-        payload = json.loads(decoded_bytes.decode("utf-8"))
+
+def decode_jwt_payload(token):
+    """Decode JWT token payload, verified if the User Pool is configured"""
+    try:
+        # Warm containers see the same token repeatedly, so decoding is cached
+        payload = _decode_jwt_payload_cached(token)
+        if payload is None:
+            return None
+
+        # Cached entries outlive the token, so re-check expiry on every call
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)) and exp <= time.time():
+            logger.warning("JWT token has expired")
+            return None
 
         return payload
 
@@ -34,19 +200,17 @@ def decode_jwt_payload(token):
         return None
 
 
-def get_user_info_from_token(event):
-    """Extract user information and groups from Cognito ID token"""
-    try:
-        # Get the ID token from the custom header
-        headers = event.get("headers", {})
+def get_id_token(event):
+    """Get the Cognito ID token from the custom request header, if any"""
+    headers = event.get("headers") or {}
 
-        # Look for custom Cognito header (case-insensitive)
-        id_token = None
-        for header_name, header_value in headers.items():
-            if header_name.lower() == "x-cognito-id-token":
-                id_token = header_value
-                break
+    # HTTP API (payload v2) always sends lowercase header names
+    return headers.get("x-cognito-id-token")
 
+
+def get_user_info_from_token(id_token):
+    """Extract user information and groups from Cognito ID token"""
+    try:
         if not id_token:
             logger.warning("No X-Cognito-Id-Token header found")
             return None, []
@@ -56,7 +220,7 @@ def get_user_info_from_token(event):
         if not token_payload:
             return None, []
 
-        logger.info(f"Token payload: {token_payload}")
+        logger.debug("Token payload: %s", token_payload)
 
         # Extract user information
         user_info = {
@@ -71,26 +235,19 @@ def get_user_info_from_token(event):
 
         # Extract groups - check various possible group claim names
         groups = []
-        possible_group_claims = [
-            "cognito:groups",
-            "groups",
-            "custom:groups",
-            "memberOf",
-            "roles",
-        ]
-
-        for claim_name in possible_group_claims:
-            if claim_name in token_payload:
-                claim_value = token_payload[claim_name]
-                if isinstance(claim_value, list):
-                    groups.extend(claim_value)
-                elif isinstance(claim_value, str):
-                    # Handle comma-separated string
-                    groups.extend([g.strip() for g in claim_value.split(",")])
-                break
-
-        logger.info(f"User info: {user_info}")
-        logger.info(f"User groups: {groups}")
+        present_claims = _GROUP_CLAIMS_SET & token_payload.keys()
+        claim_name = next((c for c in _GROUP_CLAIMS if c in present_claims), None)
+
+        if claim_name is not None:
+            claim_value = token_payload[claim_name]
+            if isinstance(claim_value, list):
+                groups.extend(claim_value)
+            elif isinstance(claim_value, str):
+                # Handle comma-separated string
+                groups.extend([g.strip() for g in claim_value.split(",")])
+
+        logger.debug("User info: %s", user_info)
+        logger.debug("User groups: %s", groups)
 
         return user_info, groups
 
@@ -113,7 +270,7 @@ def get_user_from_cognito_context(event):
             "user_agent": identity.get("userAgent"),
         }
 
-        logger.info(f"Cognito context user info: {user_info}")
+        logger.debug("Cognito context user info: %s", user_info)
         return user_info, []
 
     except Exception as e:
@@ -121,23 +278,41 @@ def get_user_from_cognito_context(event):
         return None, []
 
 
+def dumps_response_body(body):
+    """Serialize the response body as indented JSON"""
+    if ORJSON_AVAILABLE:
+        # Unlike json.dumps, orjson emits non-ASCII characters as raw UTF-8
+        # rather than \uXXXX escapes - equivalent JSON for any client
+        return orjson.dumps(body, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(body, indent=2)
+
+
 def handler(event, context):
-    logger.info("Event: %s", json.dumps(event, indent=2))
-    logger.info("Context: %s", context)
+    # Serializing the whole event is expensive, so only do it when it gets logged
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Event: %s", json.dumps(event, indent=2))
+        logger.debug("Context: %s", context)
 
-    # Try to get user info from ID token first
-    user_info, user_groups = get_user_info_from_token(event)
+    request_context = event.get("requestContext", {})
+    id_token = get_id_token(event)
 
-    # Fallback to Cognito context if no token found
-    if not user_info:
-        user_info, user_groups = get_user_from_cognito_context(event)
+    if not id_token and not request_context.get("authorizer"):
+        # Anonymous request - routes without authorization (e.g. GET /test/plain)
+        # have no authorizer context in HTTP API (payload v2) events
+        user_info, user_groups = None, []
+    else:
+        # Try to get user info from ID token first
+        user_info, user_groups = get_user_info_from_token(id_token)
+
+        # Fallback to Cognito context if no token found
+        if not user_info:
+            user_info, user_groups = get_user_from_cognito_context(event)
 
     # Check if user is admin
     is_admin = "Admin" in user_groups
     is_viewer = "Viewer" in user_groups
 
     # Extract some additional context for debugging
-    request_context = event.get("requestContext", {})
     api_info = {
         "api_id": request_context.get("apiId"),
         "stage": request_context.get("stage"),
@@ -148,19 +323,16 @@ def handler(event, context):
 
     return {
         "statusCode": 200,
-        "headers": {
-            "Content-Type": "application/json",
-        },
-        "body": json.dumps(
+        "headers": _RESPONSE_HEADERS,
+        "body": dumps_response_body(
             {
-                "message": "Hello from Lambda!",
+                "message": _HELLO_MSG,
                 "user_info": user_info,
                 "user_groups": user_groups,
                 "is_admin": is_admin,
                 "is_viewer": is_viewer,
                 "api_info": api_info,
                 "timestamp": context.aws_request_id,
-            },
-            indent=2,
+            }
         ),
     }
@@ -1,16 +1,23 @@
 #!/usr/bin/env python
 import getpass
+import io
 import json
 import os
 import subprocess
-from dataclasses import dataclass
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import boto3
 import requests
 from botocore.auth import SigV4Auth
 from botocore.awsrequest import AWSRequest
+from botocore.client import BaseClient
 from botocore.credentials import Credentials
+from requests.adapters import HTTPAdapter
 
 # Try to import pycognito for SRP authentication
 try:
@@ -22,6 +29,7 @@ except ImportError:
     PYCOGNITO_AVAILABLE = False
 
 AWS_PROFILE = os.getenv("AWS_PROFILE", "default")
+TERRAFORM_OUTPUTS_CACHE = ".terraform_outputs.cache.json"
 
 
 @dataclass
@@ -34,6 +42,49 @@ class AWSConfig:
     client_id: str
     identity_pool_id: str
     aws_profile: str = AWS_PROFILE
+    # Identity Pool "Logins" map key for the User Pool, derived from the above
+    logins_key: str = field(init=False)
+
+    def __post_init__(self):
+        self.logins_key = (
+            f"cognito-idp.{self.aws_region}.amazonaws.com/{self.user_pool_id}"
+        )
+
+
+@dataclass
+class AWSClients:
+    """Shared boto3 session and Cognito clients, created once per run"""
+
+    session: boto3.Session
+    idp_client: BaseClient
+    identity_client: BaseClient
+
+
+def load_cached_terraform_outputs(script_dir: Path) -> dict | None:
+    """Load Terraform outputs from the local cache if it is newer than the state"""
+
+    cache_file = script_dir / TERRAFORM_OUTPUTS_CACHE
+    try:
+        state_mtime = os.path.getmtime(script_dir / "terraform.tfstate")
+        if os.path.getmtime(cache_file) <= state_mtime:
+            return None
+
+        outputs = json.loads(cache_file.read_text())
+        print("Loading configuration from cached Terraform outputs...")
+        return outputs
+
+    except (OSError, ValueError):
+        # Missing state/cache or a corrupt cache - fall back to running terraform
+        return None
+
+
+def save_cached_terraform_outputs(script_dir: Path, raw_outputs: str):
+    """Save raw `terraform output -json` result for later runs"""
+
+    try:
+        (script_dir / TERRAFORM_OUTPUTS_CACHE).write_text(raw_outputs)
+    except OSError as e:
+        print(f"Warning: could not cache Terraform outputs: {e}")
 
 
 def get_terraform_outputs() -> AWSConfig | None:
@@ -43,16 +94,19 @@ def get_terraform_outputs() -> AWSConfig | None:
         # Get the directory where the script is located (should contain terraform files)
         script_dir = Path(__file__).parent.resolve()
 
-        print("Loading configuration from Terraform outputs...")
-        result = subprocess.run(
-            ["terraform", "output", "-json"],
-            capture_output=True,
-            text=True,
-            cwd=script_dir,
-            check=True,
-        )
+        outputs = load_cached_terraform_outputs(script_dir)
+        if outputs is None:
+            print("Loading configuration from Terraform outputs...")
+            result = subprocess.run(
+                ["terraform", "output", "-json"],
+                capture_output=True,
+                text=True,
+                cwd=script_dir,
+                check=True,
+            )
 
-        outputs = json.loads(result.stdout)
+            outputs = json.loads(result.stdout)
+            save_cached_terraform_outputs(script_dir, result.stdout)
 
         # Extract values from Terraform outputs and create config object
         config = AWSConfig(
@@ -81,12 +135,91 @@ def get_terraform_outputs() -> AWSConfig | None:
         return None
 
 
-def test_plain_endpoint(config: AWSConfig):
+def create_aws_clients(config: AWSConfig) -> AWSClients | None:
+    """Create the boto3 session and Cognito clients shared by all tests"""
+
+    try:
+        session = boto3.Session(profile_name=config.aws_profile)
+        return AWSClients(
+            session=session,
+            idp_client=session.client("cognito-idp", region_name=config.aws_region),
+            identity_client=session.client(
+                "cognito-identity", region_name=config.aws_region
+            ),
+        )
+
+    except Exception as e:
+        print(f"Error creating AWS clients: {e}")
+        return None
+
+
+def create_http_session() -> requests.Session:
+    """Create a keep-alive HTTP session so all probes reuse one connection"""
+
+    http = requests.Session()
+    http.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    return http
+
+
+class ThreadLocalStdout(io.TextIOBase):
+    """sys.stdout wrapper that lets worker threads buffer their own output"""
+
+    def __init__(self, stdout):
+        self.stdout = stdout
+        self.local = threading.local()
+
+    def write(self, s):
+        return getattr(self.local, "buffer", self.stdout).write(s)
+
+    def flush(self):
+        self.stdout.flush()
+
+
+@contextmanager
+def capture_thread_output():
+    """Temporarily install ThreadLocalStdout as sys.stdout"""
+
+    stdout = ThreadLocalStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        yield stdout
+    finally:
+        sys.stdout = stdout.stdout
+
+
+def run_with_captured_output(stdout: ThreadLocalStdout, fn, *args):
+    """Run a test in a worker thread, returning its result and printed output"""
+
+    stdout.local.buffer = io.StringIO()
+    try:
+        return fn(*args), stdout.local.buffer.getvalue()
+    finally:
+        del stdout.local.buffer
+
+
+def run_with_unauthenticated_credentials(
+    stdout: ThreadLocalStdout, creds_future: Future, fn, config, http
+):
+    """Run an unauthenticated probe once the shared credentials are fetched"""
+
+    creds, _ = creds_future.result()
+    return run_with_captured_output(stdout, fn, config, creds, http)
+
+
+def print_captured_output(future: Future):
+    """Print the output captured by run_with_captured_output and return the result"""
+
+    result, output = future.result()
+    print(output, end="")
+    return result
+
+
+def test_plain_endpoint(config: AWSConfig, http: requests.Session):
     """Test the /test/plain endpoint without authentication"""
     print("Testing /test/plain endpoint (no auth)...")
     try:
         url = f"{config.api_endpoint}/test/plain"
-        response = requests.get(url, timeout=30)
+        response = http.get(url, timeout=30)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
         print("-" * 50)
@@ -97,13 +230,18 @@ def test_plain_endpoint(config: AWSConfig):
         return None
 
 
-def test_auth_endpoint(config: AWSConfig):
+def test_auth_endpoint(
+    config: AWSConfig, clients: AWSClients | None, http: requests.Session
+):
     """Test the /test/auth endpoint with IAM authentication"""
     print("Testing /test/auth endpoint (IAM auth)...")
+    if clients is None:
+        print("Skipping - AWS clients not available")
+        print("-" * 50)
+        return None
+
     try:
-        # Create a session with the specified profile
-        session = boto3.Session(profile_name=config.aws_profile)
-        credentials = session.get_credentials()
+        credentials = clients.session.get_credentials()
 
         # Create the request
         url = f"{config.api_endpoint}/test/auth"
@@ -116,7 +254,7 @@ def test_auth_endpoint(config: AWSConfig):
         headers = dict(request.headers)
 
         # Make the authenticated request
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http.get(url, headers=headers, timeout=30)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
         print("-" * 50)
@@ -127,13 +265,21 @@ def test_auth_endpoint(config: AWSConfig):
         return None
 
 
-def test_cognito_auth_endpoint(config: AWSConfig, username=None, password=None):
+def test_cognito_auth_endpoint(
+    config: AWSConfig,
+    clients: AWSClients | None,
+    http: requests.Session,
+    username=None,
+    password=None,
+):
     """Test the /test/auth endpoint using Cognito authentication"""
     print("Testing /test/auth endpoint (Cognito auth)...")
-    try:
-        # Create a session with the specified profile for Cognito operations
-        session = boto3.Session(profile_name=config.aws_profile)
+    if clients is None:
+        print("Skipping - AWS clients not available")
+        print("-" * 50)
+        return None
 
+    try:
         # Get username and password if not provided
         if not username:
             username = input("Enter Cognito username: ").strip()
@@ -147,10 +293,8 @@ def test_cognito_auth_endpoint(config: AWSConfig, username=None, password=None):
                 return None
 
         # Step 1: Authenticate with Cognito User Pool
-        cognito_client = session.client("cognito-idp", region_name=config.aws_region)
-
         print("Step 1: Authenticating with Cognito User Pool...")
-        auth_response = cognito_client.initiate_auth(
+        auth_response = clients.idp_client.initiate_auth(
             ClientId=config.client_id,
             AuthFlow="USER_PASSWORD_AUTH",
             AuthParameters={"USERNAME": username, "PASSWORD": password},
@@ -161,16 +305,10 @@ def test_cognito_auth_endpoint(config: AWSConfig, username=None, password=None):
         print("✓ Successfully authenticated with User Pool")
 
         # Step 2: Get Identity ID from Identity Pool
-        cognito_identity = session.client(
-            "cognito-identity", region_name=config.aws_region
-        )
-
         print("Step 2: Getting Identity ID from Identity Pool...")
-        identity_response = cognito_identity.get_id(
+        identity_response = clients.identity_client.get_id(
             IdentityPoolId=config.identity_pool_id,
-            Logins={
-                f"cognito-idp.{config.aws_region}.amazonaws.com/{config.user_pool_id}": id_token
-            },
+            Logins={config.logins_key: id_token},
         )
 
         identity_id = identity_response["IdentityId"]
@@ -178,11 +316,9 @@ def test_cognito_auth_endpoint(config: AWSConfig, username=None, password=None):
 
         # Step 3: Get AWS credentials for the identity
         print("Step 3: Getting AWS credentials for the identity...")
-        credentials_response = cognito_identity.get_credentials_for_identity(
+        credentials_response = clients.identity_client.get_credentials_for_identity(
             IdentityId=identity_id,
-            Logins={
-                f"cognito-idp.{config.aws_region}.amazonaws.com/{config.user_pool_id}": id_token
-            },
+            Logins={config.logins_key: id_token},
         )
 
         aws_credentials = credentials_response["Credentials"]
@@ -210,7 +346,7 @@ def test_cognito_auth_endpoint(config: AWSConfig, username=None, password=None):
         headers["X-Cognito-Id-Token"] = id_token
 
         # Make the authenticated request
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http.get(url, headers=headers, timeout=30)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
         print("-" * 50)
@@ -221,15 +357,25 @@ def test_cognito_auth_endpoint(config: AWSConfig, username=None, password=None):
         return None
 
 
-def test_cognito_srp_auth(config: AWSConfig, username=None, password=None):
+def test_cognito_srp_auth(
+    config: AWSConfig,
+    clients: AWSClients | None,
+    http: requests.Session,
+    username=None,
+    password=None,
+):
     """Test the /test/auth endpoint using Cognito SRP authentication"""
     print("Testing /test/auth endpoint (Cognito SRP auth)...")
+    if clients is None:
+        print("Skipping - AWS clients not available")
+        print("-" * 50)
+        return None
 
     if not PYCOGNITO_AVAILABLE:
         print("⚠️  SRP authentication requires 'pycognito' library")
         print("   Install with: pip install pycognito")
         print("   Falling back to password authentication...")
-        return test_cognito_auth_endpoint(config, username, password)
+        return test_cognito_auth_endpoint(config, clients, http, username, password)
 
     try:
         # Get username and password if not provided
@@ -264,20 +410,13 @@ def test_cognito_srp_auth(config: AWSConfig, username=None, password=None):
             print("   - pycognito library compatibility issues")
             print("   - Network/connectivity issues")
             print("   Falling back to password authentication...")
-            return test_cognito_auth_endpoint(config, username, password)
+            return test_cognito_auth_endpoint(config, clients, http, username, password)
 
         # Continue with Identity Pool flow
-        session = boto3.Session(profile_name=config.aws_profile)
-        cognito_identity = session.client(
-            "cognito-identity", region_name=config.aws_region
-        )
-
         print("Step 2: Getting Identity ID from Identity Pool...")
-        identity_response = cognito_identity.get_id(
+        identity_response = clients.identity_client.get_id(
             IdentityPoolId=config.identity_pool_id,
-            Logins={
-                f"cognito-idp.{config.aws_region}.amazonaws.com/{config.user_pool_id}": id_token
-            },
+            Logins={config.logins_key: id_token},
         )
 
         identity_id = identity_response["IdentityId"]
@@ -285,11 +424,9 @@ def test_cognito_srp_auth(config: AWSConfig, username=None, password=None):
 
         # Step 3: Get AWS credentials for the identity
         print("Step 3: Getting AWS credentials for the identity...")
-        credentials_response = cognito_identity.get_credentials_for_identity(
+        credentials_response = clients.identity_client.get_credentials_for_identity(
             IdentityId=identity_id,
-            Logins={
-                f"cognito-idp.{config.aws_region}.amazonaws.com/{config.user_pool_id}": id_token
-            },
+            Logins={config.logins_key: id_token},
         )
 
         aws_credentials = credentials_response["Credentials"]
@@ -317,7 +454,7 @@ def test_cognito_srp_auth(config: AWSConfig, username=None, password=None):
         headers["X-Cognito-Id-Token"] = id_token
 
         # Make the authenticated request
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http.get(url, headers=headers, timeout=30)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
         print("-" * 50)
@@ -328,20 +465,20 @@ def test_cognito_srp_auth(config: AWSConfig, username=None, password=None):
         return None
 
 
-def test_unauthenticated_endpoint(config: AWSConfig):
-    """Test the /test/public endpoint using unauthenticated Cognito identity"""
-    print("Testing /test/public endpoint (Unauthenticated Cognito identity)...")
-    try:
-        # Create a session with the specified profile for Cognito operations
-        session = boto3.Session(profile_name=config.aws_profile)
+def get_unauthenticated_credentials(
+    config: AWSConfig, clients: AWSClients | None
+) -> Credentials | None:
+    """Get AWS credentials for an unauthenticated Cognito identity"""
+    print("Getting credentials for an unauthenticated Cognito identity...")
+    if clients is None:
+        print("Skipping - AWS clients not available")
+        print("-" * 50)
+        return None
 
+    try:
         # Step 1: Get Identity ID from Identity Pool (without authentication)
-        cognito_identity = session.client(
-            "cognito-identity", region_name=config.aws_region
-        )
-
         print("Step 1: Getting unauthenticated Identity ID from Identity Pool...")
-        identity_response = cognito_identity.get_id(
+        identity_response = clients.identity_client.get_id(
             IdentityPoolId=config.identity_pool_id,
             # No Logins parameter = unauthenticated access
         )
@@ -351,23 +488,40 @@ def test_unauthenticated_endpoint(config: AWSConfig):
 
         # Step 2: Get AWS credentials for the unauthenticated identity
         print("Step 2: Getting AWS credentials for the unauthenticated identity...")
-        credentials_response = cognito_identity.get_credentials_for_identity(
+        credentials_response = clients.identity_client.get_credentials_for_identity(
             IdentityId=identity_id,
             # No Logins parameter = unauthenticated access
         )
 
         aws_credentials = credentials_response["Credentials"]
         print("✓ Got AWS credentials from Identity Pool (unauthenticated role)")
+        print("-" * 50)
 
-        # Step 3: Create AWS credentials object for signing
-        creds = Credentials(
+        # Create AWS credentials object for signing
+        return Credentials(
             access_key=aws_credentials["AccessKeyId"],
             secret_key=aws_credentials["SecretKey"],
             token=aws_credentials["SessionToken"],
         )
+    except Exception as e:
+        print(f"Error with unauthenticated Cognito identity: {e}")
+        print("-" * 50)
+        return None
+
+
+def test_unauthenticated_endpoint(
+    config: AWSConfig, creds: Credentials | None, http: requests.Session
+):
+    """Test the /test/public endpoint using unauthenticated Cognito identity"""
+    print("Testing /test/public endpoint (Unauthenticated Cognito identity)...")
+    if creds is None:
+        print("Skipping - no unauthenticated Cognito identity credentials")
+        print("-" * 50)
+        return None
 
-        # Step 4: Make authenticated request to API Gateway /test/public endpoint
-        print("Step 3: Making authenticated request to /test/public endpoint...")
+    try:
+        # Make authenticated request to API Gateway /test/public endpoint
+        print("Making authenticated request to /test/public endpoint...")
         url = f"{config.api_endpoint}/test/public"
         request = AWSRequest(method="GET", url=url)
 
@@ -378,7 +532,7 @@ def test_unauthenticated_endpoint(config: AWSConfig):
         headers = dict(request.headers)
 
         # Make the authenticated request
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http.get(url, headers=headers, timeout=30)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
         print("-" * 50)
@@ -389,48 +543,21 @@ def test_unauthenticated_endpoint(config: AWSConfig):
         return None
 
 
-def test_unauthenticated_auth_endpoint(config: AWSConfig):
+def test_unauthenticated_auth_endpoint(
+    config: AWSConfig, creds: Credentials | None, http: requests.Session
+):
     """Test the /test/auth endpoint using unauthenticated Cognito identity (should fail)"""
     print(
         "Testing /test/auth endpoint (Unauthenticated Cognito identity - should fail)..."
     )
-    try:
-        # Create a session with the specified profile for Cognito operations
-        session = boto3.Session(profile_name=config.aws_profile)
-
-        # Step 1: Get Identity ID from Identity Pool (without authentication)
-        cognito_identity = session.client(
-            "cognito-identity", region_name=config.aws_region
-        )
-
-        print("Step 1: Getting unauthenticated Identity ID from Identity Pool...")
-        identity_response = cognito_identity.get_id(
-            IdentityPoolId=config.identity_pool_id,
-            # No Logins parameter = unauthenticated access
-        )
-
-        identity_id = identity_response["IdentityId"]
-        print(f"✓ Got unauthenticated Identity ID: {identity_id}")
-
-        # Step 2: Get AWS credentials for the unauthenticated identity
-        print("Step 2: Getting AWS credentials for the unauthenticated identity...")
-        credentials_response = cognito_identity.get_credentials_for_identity(
-            IdentityId=identity_id,
-            # No Logins parameter = unauthenticated access
-        )
-
-        aws_credentials = credentials_response["Credentials"]
-        print("✓ Got AWS credentials from Identity Pool (unauthenticated role)")
-
-        # Step 3: Create AWS credentials object for signing
-        creds = Credentials(
-            access_key=aws_credentials["AccessKeyId"],
-            secret_key=aws_credentials["SecretKey"],
-            token=aws_credentials["SessionToken"],
-        )
+    if creds is None:
+        print("Skipping - no unauthenticated Cognito identity credentials")
+        print("-" * 50)
+        return None
 
-        # Step 4: Try to access /test/auth endpoint (should be denied)
-        print("Step 3: Attempting to access /test/auth endpoint (expecting 403)...")
+    try:
+        # Try to access /test/auth endpoint (should be denied)
+        print("Attempting to access /test/auth endpoint (expecting 403)...")
         url = f"{config.api_endpoint}/test/auth"
         request = AWSRequest(method="GET", url=url)
 
@@ -441,7 +568,7 @@ def test_unauthenticated_auth_endpoint(config: AWSConfig):
         headers = dict(request.headers)
 
         # Make the authenticated request
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http.get(url, headers=headers, timeout=30)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
 
@@ -479,14 +606,63 @@ def main():
     print(f"Identity Pool ID: {config.identity_pool_id}")
     print("=" * 50)
 
-    # Test all endpoints
-    plain_response = test_plain_endpoint(config)
-    iam_auth_response = test_auth_endpoint(config)
+    # Create the boto3 session and clients once and share them across tests -
+    # if that fails, only the tests that need AWS are skipped
+    clients = create_aws_clients(config)
+
+    # Reuse one HTTP connection pool (and TLS handshake) for all API calls
+    http = create_http_session()
+
+    # Test all endpoints - the probes are independent, so run them concurrently
+    # and print each one's output in order once it finishes
+    with (
+        capture_thread_output() as stdout,
+        ThreadPoolExecutor(max_workers=5) as executor,
+    ):
+        # Both unauthenticated probes share one identity - they start as soon
+        # as its credentials are fetched, alongside the other probes
+        creds_future = executor.submit(
+            run_with_captured_output,
+            stdout,
+            get_unauthenticated_credentials,
+            config,
+            clients,
+        )
+        plain_future = executor.submit(
+            run_with_captured_output, stdout, test_plain_endpoint, config, http
+        )
+        iam_auth_future = executor.submit(
+            run_with_captured_output, stdout, test_auth_endpoint, config, clients, http
+        )
+        unauthenticated_public_future = executor.submit(
+            run_with_unauthenticated_credentials,
+            stdout,
+            creds_future,
+            test_unauthenticated_endpoint,
+            config,
+            http,
+        )
+        unauthenticated_auth_future = executor.submit(
+            run_with_unauthenticated_credentials,
+            stdout,
+            creds_future,
+            test_unauthenticated_auth_endpoint,
+            config,
+            http,
+        )
+
+        plain_response = print_captured_output(plain_future)
+        iam_auth_response = print_captured_output(iam_auth_future)
 
-    # Test unauthenticated Cognito identity
-    print("\nTesting Unauthenticated Cognito Identity:")
-    unauthenticated_public_response = test_unauthenticated_endpoint(config)
-    unauthenticated_auth_response = test_unauthenticated_auth_endpoint(config)
+        # Test unauthenticated Cognito identity
+        print("\nTesting Unauthenticated Cognito Identity:")
+        print_captured_output(creds_future)
+        unauthenticated_public_response = print_captured_output(
+            unauthenticated_public_future
+        )
+        unauthenticated_auth_response = print_captured_output(
+            unauthenticated_auth_future
+        )
 
     # Ask user which Cognito authentication method to test
     print("\nAuthenticated Cognito Options:")
@@ -507,9 +683,9 @@ def main():
 
     match choice:
         case "1":
-            cognito_response = test_cognito_auth_endpoint(config)
+            cognito_response = test_cognito_auth_endpoint(config, clients, http)
         case "2" if PYCOGNITO_AVAILABLE:
-            cognito_response = test_cognito_srp_auth(config)
+            cognito_response = test_cognito_srp_auth(config, clients, http)
         case "3" if PYCOGNITO_AVAILABLE:
             print("Skipping authenticated Cognito testing")
         case "2" if not PYCOGNITO_AVAILABLE: